@@ -1,16 +1,34 @@
 import sys
 import math
+import argparse
+import functools
+
+import numpy as np
 
 from OCC.Core.gp import gp_Vec, gp_Trsf, gp_Ax1, gp_Dir, gp_Pnt
-from OCC.Core.BRepPrimAPI import BRepPrimAPI_MakeBox
-from OCC.Core.BRepAlgoAPI import BRepAlgoAPI_Fuse
-from OCC.Core.BRepBuilderAPI import BRepBuilderAPI_Transform
+from OCC.Core.BRepPrimAPI import BRepPrimAPI_MakeBox, BRepPrimAPI_MakePrism
+from OCC.Core.BRepBuilderAPI import BRepBuilderAPI_MakePolygon, BRepBuilderAPI_MakeFace
+from OCC.Core.BOPAlgo import BOPAlgo_Options
 from OCC.Core.BRep import BRep_Builder
+from OCC.Core.TopLoc import TopLoc_Location
 from OCC.Core.TopoDS import TopoDS_Compound
-from OCC.Display.SimpleGui import init_display
 from OCC.Core.Quantity import Quantity_Color, Quantity_TOC_RGB
-from OCC.Core.BRepTools import breptools
-from OCC.Extend.DataExchange import write_step_file
+
+# The viewer (OpenGL/Qt) and STEP/BREP writer stacks cost hundreds of ms
+# to import; display() and export() import them lazily so headless runs
+# and the test suite never pay for them.
+
+# Let OCCT shard boolean-operation work across worker threads.
+BOPAlgo_Options.SetParallelMode(True)
+
+_DEG2RAD = math.pi / 180.0
+
+# Common reference geometry, built once and shared by callers (tests,
+# skew rotations) instead of reconstructed per use
+ORIGIN = gp_Pnt(0, 0, 0)
+AXIS_X = gp_Dir(1, 0, 0)
+AXIS_Y = gp_Dir(0, 1, 0)
+AXIS_Z = gp_Dir(0, 0, 1)
 
 
 # Parameters
@@ -32,6 +50,7 @@ PARAPET_WIDTH = 300
 PARAPET_HEIGHT = 1000
 
 SHOW_AXES = True
+SHOW_DISPLAY = True
 BACKGROUND_COLOR = "white"
 
 SAVE_STEP = True
@@ -39,32 +58,115 @@ STEP_FILENAME = "bridge_model.step"
 SAVE_BREP = True
 BREP_FILENAME = "bridge_model.brep"
 
+# Display colors, constructed once at import instead of per DisplayShape call
+_GIRDER_COLOR = Quantity_Color(0.7, 0.7, 0.75, Quantity_TOC_RGB)
+_DECK_COLOR = Quantity_Color(0.8, 0.8, 0.8, Quantity_TOC_RGB)
+_PARAPET_COLOR = Quantity_Color(0.9, 0.9, 0.85, Quantity_TOC_RGB)
+_BG_WHITE = Quantity_Color(1.0, 1.0, 1.0, Quantity_TOC_RGB)
+_BG_GRAY = Quantity_Color(0.5, 0.5, 0.5, Quantity_TOC_RGB)
+
 # Factory functions
 # from draw_i_section import create_i_section as external_i_section
 # from draw_rectangular_prism import create_rectangular_prism as external_prism
 
 #Custom Implementation:
-def create_i_section(d, bf, tf, tw, length):
-    web_height = d - 2 * tf
+def _i_outline_points(bf, tf, tw, d):
+    # (y, z) vertices of the I outline, traced counterclockwise from the
+    # bottom-left corner; matches the footprint of the old three-box build.
+    y0 = (bf - tw) / 2
+    y1 = (bf + tw) / 2
+    return (
+        (0, 0), (bf, 0), (bf, tf), (y1, tf),
+        (y1, d - tf), (bf, d - tf), (bf, d), (0, d),
+        (0, d - tf), (y0, d - tf), (y0, tf), (0, tf),
+    )
 
-    bottom_flange = BRepPrimAPI_MakeBox(length, bf, tf).Shape()
 
-    top_flange = BRepPrimAPI_MakeBox(length, bf, tf).Shape()
-    trsf = gp_Trsf()
-    trsf.SetTranslation(gp_Vec(0, 0, d - tf))
-    top_flange = BRepBuilderAPI_Transform(top_flange, trsf, True).Shape()
+@functools.lru_cache(maxsize=None)
+def create_i_section(d, bf, tf, tw, length):
+    # All girders of a bridge share one section, so the shape is built once
+    # per parameter set and the TopoDS_Shape handle is reused; positioning
+    # yields independently located shapes, leaving the cached prototype
+    # untouched.
+    #
+    # Sketching the I outline and extruding it gives a single manifold
+    # solid directly, with no boolean operations at all.
+    poly = BRepBuilderAPI_MakePolygon()
+    for y, z in _i_outline_points(bf, tf, tw, d):
+        poly.Add(gp_Pnt(0, y, z))
+    poly.Close()
+    face = BRepBuilderAPI_MakeFace(poly.Wire()).Face()
+    return BRepPrimAPI_MakePrism(face, gp_Vec(length, 0, 0)).Shape()
+
+@functools.lru_cache(maxsize=64)
+def create_rectangular_prism(width, height, length):
+    # The two parapets share dimensions, and test configurations rebuild
+    # identical decks; the cached handle is safe to share because
+    # positioning locates shapes without mutating them.
+    return BRepPrimAPI_MakeBox(length, width, height).Shape()
 
-    web = BRepPrimAPI_MakeBox(length, tw, web_height).Shape()
-    trsf = gp_Trsf()
-    trsf.SetTranslation(gp_Vec(0, (bf - tw) / 2, tf))
-    web = BRepBuilderAPI_Transform(web, trsf, True).Shape()
 
-    shape = BRepAlgoAPI_Fuse(bottom_flange, top_flange).Shape()
-    shape = BRepAlgoAPI_Fuse(shape, web).Shape()
-    return shape
+def build_girder_array(prototype_shape, ys):
 
-def create_rectangular_prism(width, height, length):
-    return BRepPrimAPI_MakeBox(length, width, height).Shape()
+    """
+    Instantiate a prototype shape at a sequence of Y offsets and return
+    the instances grouped in a single TopoDS_Compound.
+
+    This is the batch path for scale-out configurations (hundreds or
+    thousands of girders): one prototype, one tight loop of Moved()
+    instances sharing the prototype topology, one compound.
+
+    Parameters
+    ----------
+    prototype_shape : TopoDS_Shape
+        Shape to instantiate, e.g. from create_i_section.
+    ys : iterable of float
+        Y offsets at which to place the instances.
+    """
+
+    builder = BRep_Builder()
+    compound = TopoDS_Compound()
+    builder.MakeCompound(compound)
+    trsf = gp_Trsf()
+    for y in ys:
+        trsf.SetTranslation(gp_Vec(0.0, float(y), 0.0))
+        builder.Add(compound, prototype_shape.Moved(TopLoc_Location(trsf)))
+    return compound
+
+
+def _compute_positions(spacing, n_girders, overhang):
+    # Layout math shared by compute_layout; kept njit-compatible so it can
+    # be jitted when numba is available (iterative parametric studies call
+    # this in a tight loop).
+    deck_width = spacing * (n_girders - 1) + 2.0 * overhang
+    start_y = -spacing * (n_girders - 1) / 2.0
+    ys = np.empty(n_girders)
+    if n_girders == 1:
+        ys[0] = 0.0
+    else:
+        denom = n_girders - 1.0
+        for i in range(n_girders):
+            ys[i] = start_y * (denom - 2.0 * i) / denom
+    return deck_width, ys
+
+
+try:
+    from numba import njit
+    _compute_positions = njit(cache=True)(_compute_positions)
+except ImportError:
+    # numba is optional; the pure-Python version is fine at small girder
+    # counts.
+    pass
+
+
+@functools.lru_cache(maxsize=None)
+def _make_translation_loc(dx, dy, dz):
+    # Identical offsets recur across components and configurations (the
+    # two parapets, deck-relative levels), so cache the location objects
+    # instead of building gp_Trsf/gp_Vec/TopLoc_Location per call.
+    trsf = gp_Trsf()
+    trsf.SetTranslation(gp_Vec(dx, dy, dz))
+    return TopLoc_Location(trsf)
 
 
 # Base Class
@@ -102,11 +204,11 @@ class BridgeComponent:
             Translation distance along Z-axis.
         """
 
-        trsf = gp_Trsf()
-        trsf.SetTranslation(gp_Vec(dx, dy, dz))
-        self.shape = BRepBuilderAPI_Transform(self.shape, trsf, True).Shape()
+        # Moved() records the transform as a TopLoc_Location on the shape
+        # instead of deep-copying the topology.
+        self.shape = self.shape.Moved(_make_translation_loc(dx, dy, dz))
 
-    def rotate(self, axis_point, axis_direction, angle_deg):
+    def rotate(self, axis_point, axis_direction, angle_deg=None, angle_rad=None):
 
         """
         Rotate the component about a specified axis.
@@ -117,14 +219,23 @@ class BridgeComponent:
             A point on the axis of rotation.
         axis_direction : gp_Dir
             Direction vector defining the rotation axis.
-        angle_deg : float
+        angle_deg : float, optional
             Rotation angle in degrees.
+        angle_rad : float, optional
+            Rotation angle in radians; callers that already work in
+            radians can pass this to skip the conversion.
         """
 
+        if angle_deg is None and angle_rad is None:
+            raise ValueError("rotate() requires angle_deg or angle_rad")
+        if angle_deg is not None and angle_rad is not None:
+            raise ValueError("rotate() accepts angle_deg or angle_rad, not both")
+        if angle_rad is None:
+            angle_rad = angle_deg * _DEG2RAD
         axis = gp_Ax1(axis_point, axis_direction)
         trsf = gp_Trsf()
-        trsf.SetRotation(axis, math.radians(angle_deg))
-        self.shape = BRepBuilderAPI_Transform(self.shape, trsf, True).Shape()
+        trsf.SetRotation(axis, angle_rad)
+        self.shape = self.shape.Moved(TopLoc_Location(trsf))
 
 
 # Component Classes
@@ -217,9 +328,8 @@ class BridgeModel:
         - Deck elevation (Z-level)
         """
 
-        self.deck_width = self.spacing * (self.n_girders - 1) + 2 * self.overhang
-        start_y = -self.spacing * (self.n_girders - 1) / 2
-        self.girder_positions_y = [start_y + i * self.spacing for i in range(self.n_girders)]
+        self.deck_width, self.girder_positions_y = _compute_positions(
+            self.spacing, self.n_girders, self.overhang)
         self.deck_z_level = self.girder_section_d
 
     def create_components(self):
@@ -229,7 +339,7 @@ class BridgeModel:
         using parametric dimensions.
         """
         
-        for y in self.girder_positions_y:
+        for y in self.girder_positions_y.tolist():
             g = Girder(self.girder_section_d, self.girder_section_bf,
                        self.girder_section_tf, self.girder_section_tw, self.span_length)
             g.create_geometry()
@@ -250,7 +360,7 @@ class BridgeModel:
         according to the computed layout.
         """
         
-        for g, y in zip(self.girders, self.girder_positions_y):
+        for g, y in zip(self.girders, self.girder_positions_y.tolist()):
             g.translate(0, y, 0)
 
         self.deck.translate(0, -self.deck_width / 2, self.deck_z_level)
@@ -286,25 +396,47 @@ class BridgeModel:
         with color-coded components and optional axes.
         """
 
+        from OCC.Display.SimpleGui import init_display
+        from OCC.Core.BRepMesh import BRepMesh_IncrementalMesh
+
         display, start_display, *_ = init_display()
 
         view = display.View
 
         if BACKGROUND_COLOR == "white":
-            view.SetBackgroundColor(Quantity_Color(1.0, 1.0, 1.0, Quantity_TOC_RGB))
+            view.SetBackgroundColor(_BG_WHITE)
         else:
-            view.SetBackgroundColor(Quantity_Color(0.5, 0.5, 0.5, Quantity_TOC_RGB))
+            view.SetBackgroundColor(_BG_GRAY)
 
         if SHOW_AXES:
             display.display_triedron()
-        
-        for g in self.girders:
-            display.DisplayShape(g.get_shape(), color=Quantity_Color(0.7,0.7,0.75,Quantity_TOC_RGB))
 
-        display.DisplayShape(self.deck.get_shape(), color=Quantity_Color(0.8,0.8,0.8,Quantity_TOC_RGB))
+        # Group same-colored components into compounds so the viewer gets
+        # one DisplayShape call per color instead of one per shape, and
+        # defer the redraw until the last call.
+        builder = BRep_Builder()
+
+        girders_compound = TopoDS_Compound()
+        builder.MakeCompound(girders_compound)
+        for g in self.girders:
+            builder.Add(girders_compound, g.get_shape())
 
+        parapets_compound = TopoDS_Compound()
+        builder.MakeCompound(parapets_compound)
         for p in self.parapets:
-            display.DisplayShape(p.get_shape(), color=Quantity_Color(0.9,0.9,0.85,Quantity_TOC_RGB))
+            builder.Add(parapets_compound, p.get_shape())
+
+        # Coarser tessellation is enough for an interactive preview.
+        display.Context.SetDeviationCoefficient(0.01)
+
+        # Tessellate up front with the parallel mesher so the viewer reuses
+        # the triangulation instead of meshing serially on first draw.
+        for s in (girders_compound, self.deck.get_shape(), parapets_compound):
+            BRepMesh_IncrementalMesh(s, 0.01, True, 0.5, True)
+
+        display.DisplayShape(girders_compound, color=_GIRDER_COLOR, update=False)
+        display.DisplayShape(self.deck.get_shape(), color=_DECK_COLOR, update=False)
+        display.DisplayShape(parapets_compound, color=_PARAPET_COLOR, update=True)
 
         display.FitAll()
         start_display()
@@ -318,25 +450,48 @@ class BridgeModel:
         - STEP file (if SAVE_STEP is True)
         - BREP file (if SAVE_BREP is True)
         """
-        
+
+        from OCC.Core.BRepTools import breptools
+        from OCC.Core.STEPControl import STEPControl_Writer, STEPControl_AsIs
+        from OCC.Core.Interface import Interface_Static
+        from OCC.Core.IFSelect import IFSelect_RetDone
+
         if SAVE_STEP:
             print(f"Exporting STEP file: {STEP_FILENAME}")
-            write_step_file(self.assembly_shape, STEP_FILENAME)
+            writer = STEPControl_Writer()
+            Interface_Static.SetCVal("write.step.schema", "AP214IS")
+            Interface_Static.SetIVal("write.precision.mode", 1)
+            writer.Transfer(self.assembly_shape, STEPControl_AsIs)
+            status = writer.Write(STEP_FILENAME)
+            if status != IFSelect_RetDone:
+                raise IOError(f"STEP export failed: {STEP_FILENAME}")
 
         if SAVE_BREP:
             print(f"Exporting BREP file: {BREP_FILENAME}")
-            breptools.Write(self.assembly_shape, BREP_FILENAME)
+            # No triangulation/normals were computed, so skip writing them.
+            breptools.Write(self.assembly_shape, BREP_FILENAME, False, False)
 
 # Main Function - entry point
-def main():
-    
+def main(argv=None):
+
     """
     Entry point of the program.
 
     Creates the bridge model, builds the geometry, assembles
     components, optionally exports files, and opens the 3D viewer.
+    The viewer can be skipped with --no-display / --export-only for
+    headless or batch-export runs.
     """
-    
+
+    parser = argparse.ArgumentParser(description="Parametric steel girder bridge model")
+    parser.add_argument("--no-display", action="store_true",
+                        help="skip the 3D viewer (headless run)")
+    parser.add_argument("--export-only", action="store_true",
+                        help="write the CAD files and exit without opening the viewer")
+    args = parser.parse_args(argv)
+
+    show_display = SHOW_DISPLAY and not (args.no_display or args.export_only)
+
     bridge = BridgeModel(
         SPAN_LENGTH_L, N_GIRDERS, GIRDER_CENTROID_SPACING,
         GIRDER_OFFSET_FROM_EDGE, SKEW_ANGLE,
@@ -349,7 +504,8 @@ def main():
     bridge.create_components()
     bridge.position_components()
     bridge.assemble()
-    bridge.display()
+    if show_display:
+        bridge.display()
     bridge.export()
 
 
@@ -6,6 +6,8 @@ Tests various configurations and validates geometry creation
 import sys
 import os
 
+import pytest
+
 # Test different bridge configurations
 test_configurations = [
     {
@@ -50,6 +52,64 @@ test_configurations = [
 ]
 
 
+@pytest.fixture(scope="session")
+def prototype_shapes():
+    """Prototype girder/deck/parapet shapes shared across the session.
+
+    create_i_section and create_rectangular_prism are lru_cached, so
+    identical geometry built by any test is amortized to one build; the
+    fixture pins the handles for the whole session.
+    """
+    from bridge_model import create_i_section, create_rectangular_prism
+
+    return {
+        "girder": create_i_section(900, 300, 16, 10, 12000),
+        "deck": create_rectangular_prism(7000, 200, 12000),
+        "parapet": create_rectangular_prism(300, 1000, 12000),
+    }
+
+
+def test_prototype_reuse(prototype_shapes):
+    """Repeated identical geometry must come out of the prototype cache."""
+    from bridge_model import Girder, create_i_section
+
+    # A second call with the same section parameters returns the cached
+    # handle, not a rebuilt shape.
+    assert create_i_section(900, 300, 16, 10, 12000) is prototype_shapes["girder"]
+
+    # Girders built through the component API share the same prototype.
+    girder = Girder(d=900, bf=300, tf=16, tw=10, length=12000)
+    girder.create_geometry()
+    assert girder.get_shape() is prototype_shapes["girder"]
+
+
+def test_build_girder_array(prototype_shapes):
+    """The batch helper must instance the prototype, not copy it."""
+    from OCC.Core.TopoDS import TopoDS_Iterator
+    from bridge_model import build_girder_array
+
+    ys = [-3000.0, 0.0, 3000.0]
+    compound = build_girder_array(prototype_shapes["girder"], ys)
+
+    instances = []
+    it = TopoDS_Iterator(compound)
+    while it.More():
+        instances.append(it.Value())
+        it.Next()
+
+    assert len(instances) == len(ys), f"Expected {len(ys)} girder instances"
+
+    # Every instance shares the prototype's underlying topology and only
+    # differs in its location.
+    for inst in instances:
+        assert inst.IsPartner(prototype_shapes["girder"]), \
+            "Instance does not share the prototype TShape"
+
+    ys_out = sorted(inst.Location().Transformation().TranslationPart().Y()
+                    for inst in instances)
+    assert ys_out == pytest.approx(sorted(ys))
+
+
 def test_component_creation():
     """Test individual component creation."""
     print("\n" + "=" * 70)
@@ -95,9 +155,8 @@ def test_transformations():
     print("=" * 70)
     
     try:
-        from bridge_model import Girder
-        from OCC.Core.gp import gp_Pnt, gp_Dir
-        
+        from bridge_model import Girder, ORIGIN, AXIS_Z
+
         # Create a test girder
         print("\nTesting translation...")
         girder = Girder(d=900, bf=300, tf=16, tw=10, length=12000)
@@ -111,7 +170,7 @@ def test_transformations():
         print("\nTesting rotation...")
         girder2 = Girder(d=900, bf=300, tf=16, tw=10, length=12000)
         girder2.create_geometry()
-        girder2.rotate(gp_Pnt(0, 0, 0), gp_Dir(0, 0, 1), 45)
+        girder2.rotate(ORIGIN, AXIS_Z, 45)
         print("  ✓ Rotation successful")
         
         print("\n✓ All transformation tests passed!")
@@ -122,69 +181,73 @@ def test_transformations():
         return False
 
 
-def test_bridge_configurations():
-    """Test various bridge configurations."""
+@pytest.mark.parametrize("config", test_configurations, ids=lambda c: c['name'])
+def test_bridge_configuration(config):
+    """Test a single bridge configuration end to end.
+
+    Configurations are independent, so the suite parallelizes across
+    them with pytest-xdist (pytest -n auto).
+    """
+    from bridge_model import BridgeModel
+
+    bridge = BridgeModel(
+        span_length=config['span_length'],
+        n_girders=config['n_girders'],
+        spacing=config['spacing'],
+        overhang=config['overhang'],
+        skew_angle=config['skew_angle'],
+        girder_section_d=config['girder_d'],
+        girder_section_bf=config['girder_bf'],
+        girder_section_tf=config['girder_tf'],
+        girder_section_tw=config['girder_tw'],
+        deck_thickness=config['deck_thickness']
+    )
+
+    # Test layout computation
+    bridge.compute_layout()
+    assert bridge.deck_width is not None, "Deck width not computed"
+    assert len(bridge.girder_positions_y) == config['n_girders'], \
+        f"Expected {config['n_girders']} girder positions"
+
+    # Test component creation
+    bridge.create_components()
+    assert len(bridge.girders) == config['n_girders'], \
+        f"Expected {config['n_girders']} girders"
+    assert bridge.deck is not None, "Deck not created"
+    assert len(bridge.parapets) == 2, "Expected 2 parapets"
+
+    # Test positioning
+    bridge.position_components()
+
+    # Test assembly
+    bridge.assemble()
+    assert bridge.assembly_shape is not None, "Assembly shape is None"
+
+
+def run_bridge_configurations():
+    """Run every configuration sequentially (script-mode runner)."""
     print("\n" + "=" * 70)
     print("TEST 3: Bridge Configurations")
     print("=" * 70)
-    
-    from bridge_model import BridgeModel
-    
+
     all_passed = True
-    
+
     for config in test_configurations:
         print(f"\nTesting: {config['name']}")
         print("-" * 70)
-        
+
         try:
-            bridge = BridgeModel(
-                span_length=config['span_length'],
-                n_girders=config['n_girders'],
-                spacing=config['spacing'],
-                overhang=config['overhang'],
-                skew_angle=config['skew_angle'],
-                girder_section_d=config['girder_d'],
-                girder_section_bf=config['girder_bf'],
-                girder_section_tf=config['girder_tf'],
-                girder_section_tw=config['girder_tw'],
-                deck_thickness=config['deck_thickness']
-            )
-            
-            # Test layout computation
-            bridge.compute_layout()
-            assert bridge.deck_width is not None, "Deck width not computed"
-            assert len(bridge.girder_positions_y) == config['n_girders'], \
-                f"Expected {config['n_girders']} girder positions"
-            print(f"  ✓ Layout computed: Deck width = {bridge.deck_width} mm")
-            
-            # Test component creation
-            bridge.create_components()
-            assert len(bridge.girders) == config['n_girders'], \
-                f"Expected {config['n_girders']} girders"
-            assert bridge.deck is not None, "Deck not created"
-            assert len(bridge.parapets) == 2, "Expected 2 parapets"
-            print(f"  ✓ Components created: {len(bridge.girders)} girders, 1 deck, 2 parapets")
-            
-            # Test positioning
-            bridge.position_components()
-            print(f"  ✓ Components positioned")
-            
-            # Test assembly
-            bridge.assemble()
-            assert bridge.assembly_shape is not None, "Assembly shape is None"
-            print(f"  ✓ Assembly created")
-            
-            print(f"\n  ✓ {config['name']} test passed!")
-            
+            test_bridge_configuration(config)
+            print(f"  ✓ {config['name']} test passed!")
         except Exception as e:
-            print(f"\n  ✗ {config['name']} test failed: {e}")
+            print(f"  ✗ {config['name']} test failed: {e}")
             all_passed = False
-    
+
     if all_passed:
         print("\n✓ All bridge configuration tests passed!")
     else:
         print("\n✗ Some bridge configuration tests failed")
-    
+
     return all_passed
 
 
@@ -272,7 +335,7 @@ def run_all_tests():
     results = {
         "Component Creation": test_component_creation(),
         "Transformations": test_transformations(),
-        "Bridge Configurations": test_bridge_configurations(),
+        "Bridge Configurations": run_bridge_configurations(),
         "Parameter Validation": test_parameter_validation(),
     }
     